@@ -1,18 +1,15 @@
 from __future__ import annotations
-import csv, os, re, sys, glob, subprocess, shutil, concurrent.futures, multiprocessing, unicodedata, time, tempfile
-from dataclasses import dataclass, asdict
+import csv, os, re, sys, subprocess, shutil, concurrent.futures, threading, unicodedata, time, tempfile, functools, signal
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional, List, Tuple, Dict
 from concurrent.futures import CancelledError
-try:
-    from concurrent.futures.process import BrokenProcessPool
-except ImportError:
-    BrokenProcessPool = RuntimeError
 
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QPushButton, QFileDialog, QLineEdit, QHBoxLayout,
     QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QProgressBar,
-    QCheckBox, QLabel, QComboBox
+    QCheckBox, QLabel, QComboBox, QSpinBox
 )
 
 try:
@@ -30,6 +27,12 @@ NEGATIVE_WORDS = [
     "karaoke","instrumental","edit","mashup","reaction","bass boosted","tiktok","parody"
 ]
 POSITIVE_HINTS = ["official video","official audio","official","mv"]
+# hard upper bounds for the worker / fragment spin boxes, to stay clear of YouTube rate limits
+MAX_WORKERS_LIMIT = 32
+MAX_FRAGMENTS_LIMIT = 32
+
+os.environ.setdefault("PYTHONIOENCODING", "utf-8")
+os.environ.setdefault("YTDLP_ENCODING", "utf-8")
 
 FFMPEG_EXE = None
 FFMPEG_DIR = None
@@ -50,78 +53,119 @@ class Track:
     album: Optional[str] = None
     duration_ms: Optional[int] = None
     source_url: Optional[str] = None  # NEW: direct youtube url for playlist items
+    isrc: Optional[str] = None  # from the CSV when the export has an ISRC column
+    basename: str = ""  # output file name without extension, filled in on construction
+
+    def __post_init__(self):
+        if not self.basename:
+            self.basename = sanitize_filename(f"{self.artist} - {self.title}")
 
 
 FORBIDDEN_CHARS = set('\\/:*?"<>|')
 
+class _SanitizeTable(dict):
+    # str.translate table covering all of Unicode: the BMP "bad" set is prebuilt, any other
+    # code point is classified on first use and cached (a prebuilt 0x110000 table would be
+    # mostly unassigned code points and cost tens of MB)
+    def __missing__(self, cp: int):
+        value = "_" if unicodedata.category(chr(cp)).startswith("C") else cp
+        self[cp] = value
+        return value
+
+
+@functools.lru_cache(maxsize=1)
+def _sanitize_table() -> _SanitizeTable:
+    # every BMP code point in a Unicode "C*" category (controls, format, surrogates, private
+    # use, unassigned) plus the characters Windows forbids in file names, all mapped to "_";
+    # built on the first sanitize call rather than at import
+    bad = frozenset(
+        c for c in map(chr, range(0x10000)) if unicodedata.category(c).startswith("C")
+    ) | FORBIDDEN_CHARS
+    return _SanitizeTable(str.maketrans(dict.fromkeys(bad, "_")))
+
+
+_MULTISPACE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_RESERVED_RE = re.compile(r"CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9]")
+# plain substring matches, same as `word in title`
+_NEGATIVE_RE = re.compile("|".join(map(re.escape, NEGATIVE_WORDS)))
+_POSITIVE_RE = re.compile("|".join(map(re.escape, POSITIVE_HINTS)))
+
 
 def sanitize_filename(name: str) -> str:
-    name = unicodedata.normalize("NFKC", (name or "").strip())
-    cleaned = []
-    for ch in name:
-        if ch in FORBIDDEN_CHARS or unicodedata.category(ch).startswith("C"):
-            cleaned.append("_")
-        else:
-            cleaned.append(ch)
-    name = "".join(cleaned)
-    name = re.sub(r"\s+", " ", name).rstrip(". ")
+    name = (name or "").strip()
+    if not name.isascii():
+        # NFKC leaves ASCII unchanged
+        name = unicodedata.normalize("NFKC", name)
+    name = name.translate(_sanitize_table())
+    name = _MULTISPACE.sub(" ", name).rstrip(". ")
     base_upper = name.split(".")[0].upper()
-    if base_upper in {"CON","PRN","AUX","NUL"} or re.fullmatch(r"(COM|LPT)[1-9]", base_upper):
+    if _RESERVED_RE.fullmatch(base_upper):
         name = "_" + name
     return name[:180]
 
 
+# the same titles and uploaders come back across candidates and searches
+@functools.lru_cache(maxsize=4096)
 def _norm(s: str) -> str:
-    s = unicodedata.normalize("NFKC", (s or "").lower())
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = (s or "").lower()
+    if not s.isascii():
+        s = unicodedata.normalize("NFKC", s)
+    s = _PUNCT_RE.sub(" ", s)
+    s = _MULTISPACE.sub(" ", s).strip()
     return s
 
 
-def _jaccard(a: str, b: str) -> float:
-    A = set(_norm(a).split())
-    B = set(_norm(b).split())
+@functools.lru_cache(maxsize=4096)
+def _tokens(s: str) -> frozenset:
+    return frozenset(_norm(s).split())
+
+
+def _jaccard(A: frozenset, B: frozenset) -> float:
     if not A or not B:
         return 0.0
-    return len(A & B) / len(A | B)
+    common = len(A & B)
+    return common / (len(A) + len(B) - common)
 
 
 def parse_spotify_csv(path: str) -> List[Track]:
     tracks: List[Track] = []
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames is None:
-            f.seek(0)
-            reader2 = csv.reader(f)
-            for row in reader2:
-                if len(row) >= 2:
-                    tracks.append(Track(title=row[0], artist=row[1]))
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
             return tracks
 
-        fields = {(name or "").strip().lower(): (name or "") for name in reader.fieldnames}
-        title_key = artist_key = album_key = duration_key = None
-        for k_lower, original in fields.items():
-            if title_key is None and ("track name" in k_lower or k_lower == "title"):
-                title_key = original
-            if artist_key is None and ("artist" in k_lower):
-                artist_key = original
-            if album_key is None and ("album" in k_lower):
-                album_key = original
-            if duration_key is None and ("duration" in k_lower and "ms" in k_lower):
-                duration_key = original
-
+        ti = ai = bi = di = ii = -1
+        for i, name in enumerate(header):
+            k_lower = (name or "").strip().lower()
+            if ti < 0 and ("track name" in k_lower or k_lower == "title"):
+                ti = i
+            if ai < 0 and ("artist" in k_lower):
+                ai = i
+            if bi < 0 and ("album" in k_lower):
+                bi = i
+            if di < 0 and ("duration" in k_lower and "ms" in k_lower):
+                di = i
+            if ii < 0 and k_lower == "isrc":
+                ii = i
+
+        append = tracks.append
         for row in reader:
-            title = (row.get(title_key) or "").strip()
-            artist = (row.get(artist_key) or "").strip()
-            album = (row.get(album_key) or "").strip() if album_key else None
+            n = len(row)
+            title = row[ti].strip() if 0 <= ti < n else ""
+            artist = row[ai].strip() if 0 <= ai < n else ""
+            if not (title and artist):
+                continue
+            album = row[bi].strip() if 0 <= bi < n else ""
             dur = None
-            if duration_key:
+            if di >= 0:
                 try:
-                    dur = int((row.get(duration_key) or "0").strip())
+                    dur = int((row[di] if di < n else "").strip() or "0")
                 except Exception:
                     dur = None
-            if title and artist:
-                tracks.append(Track(title=title, artist=artist, album=album or None, duration_ms=dur))
+            isrc = row[ii].strip() if 0 <= ii < n else ""
+            append(Track(title=title, artist=artist, album=album or None, duration_ms=dur, isrc=isrc or None))
     return tracks
 
 
@@ -180,19 +224,132 @@ def _popen_silent(cmd: list[str]) -> subprocess.Popen:
     )
 
 
-def hard_convert_to_mp3_proc(in_path: str, out_path: str, kill_event, pause_event) -> bool:
-    ffmpeg, _ = resolve_ffmpeg()
+# source audio codecs that can be stream-copied as-is, and the container to put them in
+COPY_CONTAINERS = {"aac": ".m4a", "mp4a": ".m4a", "opus": ".opus", "vorbis": ".ogg"}
+
+
+def _copy_ext(info: Optional[dict]) -> Optional[str]:
+    # container for a lossless remux of info's audio codec, or None if it has to be re-encoded
+    acodec = ((info or {}).get("acodec") or "").split(".")[0].lower()
+    return COPY_CONTAINERS.get(acodec)
+
+# re-encode targets: output extension and ffmpeg audio codec args
+ENCODE_TARGETS = {
+    "mp3": (".mp3", ["-codec:a", "libmp3lame", "-q:a", "4"]),
+    "aac": (".m4a", ["-codec:a", "aac", "-b:a", "192k"]),
+}
+
+
+_COVER_LOCAL = threading.local()
+
+
+def _cover_session() -> "requests.Session":
+    # one keep-alive session per thread (Session itself is not guaranteed thread-safe)
+    session = getattr(_COVER_LOCAL, "session", None)
+    if session is None:
+        session = _COVER_LOCAL.session = requests.Session()
+    return session
+
+
+@functools.lru_cache(maxsize=32)
+def _cover_bytes(cover_url: str) -> bytes:
+    # raises instead of returning None so a failed fetch is retried next time, not cached
+    r = _cover_session().get(cover_url, timeout=10)
+    r.raise_for_status()
+    if not r.content:
+        raise ValueError("empty cover image")
+    return r.content
+
+
+# cover prefetches overlap the audio download; threads are only started on first submit
+_COVER_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="cover")
+
+
+def _thumb_url(info: Optional[dict]) -> Optional[str]:
+    if not info:
+        return None
+    url = info.get("thumbnail")
+    if not url:
+        thumbs = info.get("thumbnails") or []
+        if thumbs:
+            url = (thumbs[-1] or {}).get("url")
+    return url
+
+
+def _fetch_cover(cover_url: Optional[str]) -> Optional[str]:
+    # the caller owns (and deletes) the returned temp file; the image bytes stay cached
+    if not cover_url or not requests:
+        return None
+    try:
+        data = _cover_bytes(cover_url)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+            tmp.write(data)
+            return tmp.name
+    except Exception:
+        pass
+    return None
+
+
+def _tag_args(tags: Dict[str, str], with_cover: bool, codec: str = "mp3") -> list[str]:
+    args = ["-write_id3v2", "1", "-id3v2_version", "3"] if codec == "mp3" else []
+    for key in ("title", "artist", "album"):
+        if tags.get(key):
+            args += ["-metadata", f"{key}={tags[key]}"]
+    if with_cover:
+        args += [
+            "-metadata:s:v", "title=Album cover",
+            "-metadata:s:v", "comment=Cover (front)",
+        ]
+    return args
+
+
+_CAN_SUSPEND = hasattr(signal, "SIGSTOP")
+
+
+def hard_convert_audio_proc(
+    in_path: str,
+    out_path: str,
+    kill_event,
+    pause_event,
+    prefer_copy: bool = False,
+    tags: Optional[Dict[str, str]] = None,
+    cover_file: Optional[str] = None,
+    codec: str = "mp3",
+    threads: int = 0,
+) -> bool:
+    ffmpeg = FFMPEG_EXE or resolve_ffmpeg()[0]
     if not ffmpeg:
         return False
 
-    cmd = [
-        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
-        "-i", in_path, "-vn",
-        "-codec:a", "libmp3lame", "-q:a", "4", "-ar", "44100", "-ac", "2",
-        out_path
-    ]
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", in_path]
+    if prefer_copy:
+        cmd += ["-vn", "-c:a", "copy"]
+        if tags is not None:
+            # text tags only: the copied containers (ogg/opus) have no attached-picture stream
+            cmd += _tag_args(tags, False, "copy")
+    else:
+        if cover_file:
+            cmd += [
+                "-i", cover_file,
+                "-map", "0:a", "-map", "1:v",
+                "-codec:v", "mjpeg", "-disposition:v:0", "attached_pic",
+            ]
+        else:
+            cmd += ["-vn"]
+        cmd += ENCODE_TARGETS[codec][1] + ["-ar", "44100", "-ac", "2"]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        if tags is not None:
+            cmd += _tag_args(tags, bool(cover_file), codec)
+    cmd += [out_path]
     try:
         p = _popen_silent(cmd)
+    except Exception:
+        return False
+
+    # block in the kernel between checks; on POSIX a pause also suspends ffmpeg itself
+    stopped = False
+    try:
         while True:
             if kill_event.is_set():
                 try:
@@ -200,32 +357,40 @@ def hard_convert_to_mp3_proc(in_path: str, out_path: str, kill_event, pause_even
                 except Exception:
                     pass
                 try:
-                    p.kill()
+                    p.kill()  # also ends a SIGSTOPped process
                 except Exception:
                     pass
+                p.wait()
                 return False
-            while pause_event.is_set() and not kill_event.is_set():
-                time.sleep(0.1)
-            rc = p.poll()
-            if rc is not None:
+            if _CAN_SUSPEND and pause_event.is_set() != stopped:
+                stopped = not stopped
+                p.send_signal(signal.SIGSTOP if stopped else signal.SIGCONT)
+            try:
+                p.wait(timeout=0.25)
                 break
-            time.sleep(0.05)
-        ok = (p.returncode == 0)
-        return ok and os.path.exists(out_path) and os.path.getsize(out_path) > 0
+            except subprocess.TimeoutExpired:
+                pass
     except Exception:
         return False
 
+    if kill_event.is_set():
+        return False
+    while pause_event.is_set() and not kill_event.is_set():
+        time.sleep(0.1)
+    ok = (p.returncode == 0)
+    return ok and os.path.exists(out_path) and os.path.getsize(out_path) > 0
+
 
-def _score_candidate(e, want_title: str, want_artist: str, target_sec: Optional[int]) -> float:
+def _score_candidate(e, want_title: frozenset, want_artist: frozenset, target_sec: Optional[int]) -> float:
+    # want_title / want_artist are token sets from _tokens(), built once per track by _pick_best
     title = e.get("title") or ""
     uploader = (e.get("uploader") or e.get("channel") or "")
     duration = e.get("duration")
     nl_title = _norm(title)
-    for bad in NEGATIVE_WORDS:
-        if bad in nl_title:
-            return -1.0
-    s_title = _jaccard(title, want_title)
-    s_artist = _jaccard(uploader or (e.get("artist") or ""), want_artist)
+    if _NEGATIVE_RE.search(nl_title):
+        return -1.0
+    s_title = _jaccard(frozenset(nl_title.split()), want_title)
+    s_artist = _jaccard(_tokens(uploader or (e.get("artist") or "")), want_artist)
     s_pair = 0.6 * s_title + 0.4 * s_artist
     dur_bonus = 0.0
     if target_sec and duration:
@@ -235,95 +400,63 @@ def _score_candidate(e, want_title: str, want_artist: str, target_sec: Optional[
     channel_bonus = 0.0
     if " - topic" in up or up.endswith("topic"):
         channel_bonus += 0.25
-    if "official" in up or any(h in nl_title for h in POSITIVE_HINTS):
+    if "official" in up or _POSITIVE_RE.search(nl_title):
         channel_bonus += 0.15
     return s_pair + dur_bonus + channel_bonus
 
 
 def _pick_best(entries: List[dict], title: str, artist: str, target_sec: Optional[int]) -> Optional[dict]:
-    best, best_score = None, -1.0
-    for e in entries:
-        sc = _score_candidate(e, title, artist, target_sec)
-        if sc > best_score:
-            best, best_score = e, sc
+    want_title, want_artist = _tokens(title), _tokens(artist)
+    scored = ((_score_candidate(e, want_title, want_artist, target_sec), e) for e in entries)
+    best_score, best = max(scored, key=lambda p: p[0], default=(-1.0, None))
     if best is None or best_score < 0.40:
         return None
     return best
 
 
-def _ffmpeg_embed_meta(mp3_path: str, title: str, artist: str, album: str, cover_url: Optional[str]) -> bool:
-    ffmpeg = FFMPEG_EXE or shutil.which("ffmpeg") or shutil.which("ffmpeg.exe")
-    if not ffmpeg:
-        return False
-
-    tmp_out = mp3_path + ".tmp"
-    cover_file = None
-
-    if cover_url and requests:
-        try:
-            r = requests.get(cover_url, timeout=10)
-            if r.ok and r.content:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                    tmp.write(r.content)
-                    cover_file = tmp.name
-        except Exception:
-            cover_file = None
-
-    try:
-        if cover_file:
-            cmd = [
-                ffmpeg, "-y",
-                "-i", mp3_path,
-                "-i", cover_file,
-                "-map", "0:a", "-map", "1:v",
-                "-codec:a", "copy",
-                "-codec:v", "mjpeg",
-                "-disposition:v:0", "attached_pic",
-                "-write_id3v2", "1",
-                "-id3v2_version", "3",
-                "-metadata", f"title={title}",
-                "-metadata", f"artist={artist}",
-            ]
-            if album:
-                cmd += ["-metadata", f"album={album}"]
-            cmd += [
-                "-metadata:s:v", "title=Album cover",
-                "-metadata:s:v", "comment=Cover (front)",
-                tmp_out
-            ]
-        else:
-            cmd = [
-                ffmpeg, "-y",
-                "-i", mp3_path,
-                "-codec:a", "copy",
-                "-write_id3v2", "1",
-                "-id3v2_version", "3",
-                "-metadata", f"title={title}",
-                "-metadata", f"artist={artist}",
-            ]
-            if album:
-                cmd += ["-metadata", f"album={album}"]
-            cmd += [tmp_out]
-
-        p = _popen_silent(cmd)
-        p.wait()
-        ok = (p.returncode == 0) and os.path.exists(tmp_out) and os.path.getsize(tmp_out) > 0
-        if ok:
-            os.replace(tmp_out, mp3_path)
-            return True
-        else:
-            if os.path.exists(tmp_out):
-                try:
-                    os.remove(tmp_out)
-                except Exception:
-                    pass
-            return False
-    finally:
-        if cover_file:
-            try:
-                os.remove(cover_file)
-            except Exception:
-                pass
+# query -> slim copy of the picked search entry, shared by the pool threads. Only scalar fields
+# are kept: the format list holds signed stream URLs that expire after a few hours and that
+# yt-dlp sorts in place, so a cache hit is re-extracted from its watch URL instead
+_SEARCH_CACHE_FIELDS = (
+    "id", "webpage_url", "title", "uploader", "channel", "artist", "duration", "acodec", "thumbnail",
+)
+_SEARCH_CACHE: "OrderedDict[Tuple[str, Optional[int]], dict]" = OrderedDict()
+_SEARCH_CACHE_SIZE = 128
+_SEARCH_LOCK = threading.Lock()
+
+
+def _search_best(
+    ydl, query: str, title: str, artist: str, target_sec: Optional[int], strict: bool = False
+) -> Optional[dict]:
+    # strict: return None instead of the top hit when no entry passes _pick_best
+    key = (query, target_sec)
+    with _SEARCH_LOCK:
+        cached = _SEARCH_CACHE.get(key)
+        if cached is not None:
+            _SEARCH_CACHE.move_to_end(key)
+            return dict(cached)
+
+    info = ydl.extract_info(query, download=False)
+    entries = [e for e in ((info or {}).get("entries") or []) if e]
+    if not entries:
+        return None
+    chosen = _pick_best(entries, title, artist, target_sec)
+    if chosen is None:
+        if strict:
+            return None
+        chosen = entries[0]
+
+    slim = {k: chosen[k] for k in _SEARCH_CACHE_FIELDS if chosen.get(k) is not None}
+    if not slim.get("webpage_url") and slim.get("id"):
+        slim["webpage_url"] = f"https://www.youtube.com/watch?v={slim['id']}"
+    with _SEARCH_LOCK:
+        _SEARCH_CACHE[key] = slim
+        if len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+    return chosen
+
+
+@functools.lru_cache(maxsize=1)
 def resolve_ffmpeg() -> tuple[Optional[str], Optional[str]]:
     try:
         import imageio_ffmpeg as iio_ffmpeg
@@ -349,18 +482,84 @@ def resolve_ffmpeg() -> tuple[Optional[str], Optional[str]]:
 
     return None, None
 
-def process_one(
-    index: int,
-    t: Dict,
-    out_dir: str,
-    embed_metadata: bool,
-    kill_event,
-    pause_event,
-    accelerated: bool,
-    keep_original: bool,
-) -> Tuple[int, bool, str, str]:
-    os.environ.setdefault("PYTHONIOENCODING", "utf-8")
-    os.environ.setdefault("YTDLP_ENCODING", "utf-8")
+
+_BASE_YDL_OPTS = {
+    "noprogress": True,
+    "quiet": True,
+    "ignoreerrors": True,
+    "noplaylist": True,
+    "format": "bestaudio/best",
+    "postprocessors": [],
+    "prefer_ffmpeg": True,
+    "retries": 5,
+    "fragment_retries": 5,
+    "continuedl": True,
+    "socket_timeout": 30,
+    "throttledratelimit": 0,
+}
+
+
+_YDL_LOCAL = threading.local()
+
+
+def _ydl_progress_hook(ctx: dict, d):
+    # ctx belongs to one YoutubeDL; process_one fills in the current track's events, and the
+    # hook records the files yt-dlp writes (it may run on yt-dlp's fragment threads)
+    if d.get("tmpfilename"):
+        ctx["part_file"] = d["tmpfilename"]
+    if d.get("status") == "finished" and d.get("filename"):
+        ctx["finished_file"] = d["filename"]
+    kill_event, pause_event = ctx["kill_event"], ctx["pause_event"]
+    while pause_event.is_set() and not kill_event.is_set():
+        time.sleep(0.1)
+    if kill_event.is_set():
+        raise yt_dlp.utils.DownloadError("killed by user")
+
+
+def _thread_ydl(
+    ffmpeg_location: Optional[str], fragments: int, accelerated: bool
+) -> Tuple["yt_dlp.YoutubeDL", dict]:
+    # one YoutubeDL per pool thread, reused across tracks; only outtmpl changes per track.
+    # with `requests` installed yt-dlp routes through its pooled session, so keep-alive
+    # connections to YouTube survive between tracks handled by the same thread
+    key = (ffmpeg_location, fragments, accelerated)
+    ydl = getattr(_YDL_LOCAL, "ydl", None)
+    if ydl is None or _YDL_LOCAL.key != key:
+        ctx = {"part_file": None, "finished_file": None, "kill_event": None, "pause_event": None}
+        ydl = yt_dlp.YoutubeDL(dict(
+            _BASE_YDL_OPTS,
+            ffmpeg_location=ffmpeg_location,
+            concurrent_fragment_downloads=fragments,
+            http_chunk_size=2_097_152 if accelerated else 1_048_576,
+            progress_hooks=[functools.partial(_ydl_progress_hook, ctx)],
+        ))
+        _YDL_LOCAL.ydl, _YDL_LOCAL.key, _YDL_LOCAL.ctx = ydl, key, ctx
+    return ydl, _YDL_LOCAL.ctx
+
+
+@dataclass(frozen=True)
+class RunSettings:
+    # options of one download run, passed to every process_one call; the pool itself only
+    # depends on the worker count, so changing these between runs keeps its threads
+    out_dir: str
+    embed_metadata: bool
+    accelerated: bool
+    fragments: int
+    keep_original: bool
+    prefer_copy: bool
+    skip_existing: bool
+    codec: str
+    kill_event: threading.Event
+    pause_event: threading.Event
+    ffmpeg_threads: int = 0
+
+
+def process_one(index: int, t: Track, rs: RunSettings) -> Tuple[int, bool, str, str]:
+    out_dir, embed_metadata = rs.out_dir, rs.embed_metadata
+    keep_original, prefer_copy, skip_existing = rs.keep_original, rs.prefer_copy, rs.skip_existing
+    codec, threads = rs.codec, rs.ffmpeg_threads
+    out_ext = ENCODE_TARGETS[codec][0]
+    kill_event, pause_event = rs.kill_event, rs.pause_event
 
     ffmpeg_exe, ffmpeg_dir = resolve_ffmpeg()
 
@@ -370,74 +569,53 @@ def process_one(
     if not keep_original and not ffmpeg_exe:
         return index, False, "ffmpeg is not available", ""
 
-    if ffmpeg_dir:
-        os.environ["PATH"] = ffmpeg_dir + os.pathsep + os.environ.get("PATH", "")
-
-    title = (t.get("title") or "").strip()
-    artist = (t.get("artist") or "").strip()
-    album = (t.get("album") or "").strip()
-    duration_ms = t.get("duration_ms", None)
-    source_url = (t.get("source_url") or "").strip() or None
-
-    basename = sanitize_filename(f"{artist} - {title}")
-
+    title = (t.title or "").strip()
+    artist = (t.artist or "").strip()
+    album = (t.album or "").strip()
+    duration_ms = t.duration_ms
+    source_url = (t.source_url or "").strip() or None
+    isrc = (t.isrc or "").strip()
+    basename = t.basename
+
+    if skip_existing and not keep_original:
+        exts = set(COPY_CONTAINERS.values()) if prefer_copy else {out_ext}
+        for ext in exts:
+            final = os.path.join(out_dir, basename + ext)
+            if os.path.isfile(final) and os.path.getsize(final) > 10_000:
+                return index, True, "Done (already present)", final
+
+    ctx: dict = {}
     try:
         target_sec = (int(duration_ms) // 1000) if duration_ms else None
 
-        def build_opts():
-            outtmpl = os.path.join(out_dir, f"{basename}.%(ext)s")
-            return {
-                "outtmpl": outtmpl,
-                "noprogress": True,
-                "quiet": True,
-                "ignoreerrors": True,
-                "noplaylist": True,
-                "format": "bestaudio/best",
-                "postprocessors": [],
-                "prefer_ffmpeg": True,
-                "ffmpeg_location": ffmpeg_dir or ffmpeg_exe,
-                "retries": 5,
-                "fragment_retries": 5,
-                "continuedl": True,
-                "concurrent_fragment_downloads": 3 if accelerated else 1,
-                "socket_timeout": 30,
-                "http_chunk_size": 2_097_152 if accelerated else 1_048_576,
-                "throttledratelimit": 0,
-            }
-
-        def hook(d):
-            while pause_event.is_set() and not kill_event.is_set():
-                time.sleep(0.1)
-            if kill_event.is_set():
-                raise yt_dlp.utils.DownloadError("killed by user")
-
-        opts = build_opts()
-        opts["progress_hooks"] = [hook]
+        ydl, ctx = _thread_ydl(ffmpeg_dir or ffmpeg_exe, rs.fragments, rs.accelerated)
+        ydl.params["outtmpl"]["default"] = os.path.join(out_dir, f"{basename}.%(ext)s")
+        ctx.update(part_file=None, finished_file=None, kill_event=kill_event, pause_event=pause_event)
 
         if kill_event.is_set():
             return index, False, "Canceled", ""
 
         chosen = None
         chosen_info = None
+        cover_prefetch = prefetch_url = None
 
         if source_url:
             url = source_url
             while pause_event.is_set() and not kill_event.is_set():
                 time.sleep(0.1)
 
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                chosen_info = ydl.extract_info(url, download=True)
-
+            chosen_info = ydl.extract_info(url, download=True)
             chosen = chosen_info or {}
         else:
-            query = f"ytsearch10:{artist} - {title} official"
-
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(query, download=False)
-                entries = (info or {}).get("entries") or []
-                if not entries:
-                    return index, False, "No results found", ""
-                chosen = _pick_best(entries, title, artist, target_sec) or entries[0]
+            if isrc:
+                # YouTube indexes ISRCs of label uploads; the single hit is still scored so an
+                # unrelated video falls through to the name search
+                chosen = _search_best(ydl, f"ytsearch1:{isrc}", title, artist, target_sec, strict=True)
+            if chosen is None:
+                query = f"ytsearch10:{artist} - {title} official"
+                chosen = _search_best(ydl, query, title, artist, target_sec)
+            if chosen is None:
+                return index, False, "No results found", ""
 
             if kill_event.is_set():
                 return index, False, "Canceled", ""
@@ -445,12 +623,32 @@ def process_one(
             while pause_event.is_set() and not kill_event.is_set():
                 time.sleep(0.1)
 
-            url = chosen.get("webpage_url") or chosen.get("url")
-            if not url:
-                return index, False, "Unknown link", ""
-
-            with yt_dlp.YoutubeDL(opts) as ydl2:
-                ydl2.download([url])
+            # the search entry already names the thumbnail: fetch it while the audio downloads;
+            # a remux embeds no cover, so entries with a copyable codec skip it
+            will_remux = prefer_copy and _copy_ext(chosen)
+            if embed_metadata and not keep_original and requests and not will_remux:
+                prefetch_url = _thumb_url(chosen)
+                if prefetch_url:
+                    cover_prefetch = _COVER_POOL.submit(_cover_bytes, prefetch_url)
+
+            if chosen.get("formats"):
+                # search entries are fully extracted already; download from the same info dict
+                chosen_info = ydl.process_ie_result(chosen, download=True)
+            else:
+                url = chosen.get("webpage_url") or chosen.get("url")
+                if not url:
+                    return index, False, "Unknown link", ""
+                chosen_info = ydl.extract_info(url, download=True)
+            chosen = chosen_info or chosen
+
+        src_file = None
+        if chosen_info:
+            downloads = chosen_info.get("requested_downloads") or [{}]
+            src_file = (
+                downloads[0].get("filepath")
+                or ctx["finished_file"]
+                or ydl.prepare_filename(chosen_info)
+            )
 
         if kill_event.is_set():
             return index, False, "Canceled", ""
@@ -458,67 +656,105 @@ def process_one(
         while pause_event.is_set() and not kill_event.is_set():
             time.sleep(0.1)
 
-        pattern = os.path.join(out_dir, glob.escape(basename) + ".*")
-        candidates = [
-            p for p in glob.glob(pattern)
-            if not p.lower().endswith(".mp3") and not p.lower().endswith(".part")
-        ]
-
-        if not candidates:
+        if not src_file or not os.path.isfile(src_file):
             return index, False, "Downloaded file not found", ""
 
-        candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        src_file = candidates[0]
-
         if keep_original:
             return index, True, "Done (original)", src_file
 
-        mp3_path = os.path.join(out_dir, f"{basename}.mp3")
-        ok = hard_convert_to_mp3_proc(src_file, mp3_path, kill_event, pause_event)
+        tags = cover_file = None
+        if embed_metadata:
+            tags = {"title": title, "artist": artist, "album": album}
+
+        if prefer_copy:
+            copy_ext = _copy_ext(chosen)
+            if copy_ext:
+                out_path = os.path.join(out_dir, f"{basename}{copy_ext}")
+                in_place = os.path.normcase(out_path) == os.path.normcase(src_file)
+                if in_place and tags is None:
+                    return index, True, "Done (remux)", src_file
+                # ffmpeg cannot write over its own input: tag into a temp name, then swap it in
+                work_path = os.path.join(out_dir, f"{basename}.tmp{copy_ext}") if in_place else out_path
+                if not hard_convert_audio_proc(
+                    src_file, work_path, kill_event, pause_event, prefer_copy=True, tags=tags
+                ):
+                    try:
+                        if os.path.exists(work_path):
+                            os.remove(work_path)
+                    except Exception:
+                        pass
+                    return index, False, "FFmpeg remux failed/canceled", ""
+                try:
+                    if in_place:
+                        os.replace(work_path, out_path)
+                    elif os.path.exists(src_file):
+                        os.remove(src_file)
+                except Exception:
+                    pass
+                return index, True, "Done (remux)", out_path
+
+        enc_path = os.path.join(out_dir, f"{basename}{out_ext}")
+        # an m4a download re-encoded to AAC lands on its own path; encode beside it and swap
+        in_place = os.path.normcase(enc_path) == os.path.normcase(src_file)
+        work_path = os.path.join(out_dir, f"{basename}.tmp{out_ext}") if in_place else enc_path
+        if embed_metadata:
+            thumb_url = _thumb_url(chosen)
+            if cover_prefetch is not None:
+                try:
+                    cover_prefetch.result()  # lands in the _cover_bytes cache
+                except Exception:
+                    if thumb_url == prefetch_url:
+                        thumb_url = None  # already failed once for this track
+            cover_file = _fetch_cover(thumb_url)
+
+        try:
+            ok = hard_convert_audio_proc(
+                src_file, work_path, kill_event, pause_event,
+                tags=tags, cover_file=cover_file, codec=codec, threads=threads,
+            )
+            if not ok and cover_file and not kill_event.is_set():
+                # unusable cover image: keep the track and the text tags
+                ok = hard_convert_audio_proc(
+                    src_file, work_path, kill_event, pause_event, tags=tags, codec=codec, threads=threads
+                )
+        finally:
+            if cover_file:
+                try:
+                    os.remove(cover_file)
+                except Exception:
+                    pass
 
         if not ok:
             try:
-                if os.path.exists(mp3_path):
-                    os.remove(mp3_path)
+                if os.path.exists(work_path):
+                    os.remove(work_path)
             except Exception:
                 pass
-            return index, False, "FFmpeg conversion to MP3 failed/canceled", ""
+            return index, False, f"FFmpeg conversion to {codec.upper()} failed/canceled", ""
 
         try:
-            if os.path.exists(src_file):
+            if in_place:
+                os.replace(work_path, enc_path)
+            elif os.path.exists(src_file):
                 os.remove(src_file)
         except Exception:
             pass
 
         if kill_event.is_set():
             try:
-                if os.path.exists(mp3_path):
-                    os.remove(mp3_path)
+                if os.path.exists(enc_path):
+                    os.remove(enc_path)
             except Exception:
                 pass
             return index, False, "Canceled", ""
 
-        if embed_metadata:
-            thumb_url = None
-            if chosen:
-                thumb_url = chosen.get("thumbnail")
-                if not thumb_url:
-                    thumbs = chosen.get("thumbnails") or []
-                    if thumbs:
-                        thumb_url = (thumbs[-1] or {}).get("url")
-
-            _ffmpeg_embed_meta(mp3_path, title, artist, album, thumb_url)
-
-        return index, True, "Done", mp3_path
+        return index, True, "Done", enc_path
 
     except yt_dlp.utils.DownloadError as e:
+        part_file = ctx.get("part_file")
         try:
-            part_glob = os.path.join(out_dir, basename + ".*.part")
-            for p in glob.glob(part_glob):
-                try:
-                    os.remove(p)
-                except Exception:
-                    pass
+            if part_file and os.path.exists(part_file):
+                os.remove(part_file)
         except Exception:
             pass
 
@@ -531,13 +767,25 @@ def process_one(
         return index, False, f"Error: {e}", ""
 
 def _compute_workers(accelerated: bool) -> int:
+    # downloads wait on the network, not the CPU, so accelerated mode oversubscribes the cores
     cpu = os.cpu_count() or 2
     if accelerated:
-        return max(1, cpu - 1)
+        return max(4, min(cpu * 2, 16))
     return max(1, min(4, max(1, cpu // 2)))
 
 
+def _compute_fragments(accelerated: bool) -> int:
+    return 16 if accelerated else 1
+
+
+def _ffmpeg_threads(workers: int) -> int:
+    # split the cores between the ffmpeg processes that can run at once
+    return max(1, (os.cpu_count() or 4) // max(1, workers))
+
+
 class MainWindow(QWidget):
+    resultReady = pyqtSignal(int, bool, str, str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CSV or YouTube Playlist -> MP3 Downloader (pause/resume, cover embed)")
@@ -558,19 +806,35 @@ class MainWindow(QWidget):
 
         self.chk_metadata = QCheckBox("Embed metadata and cover")
         self.chk_metadata.setChecked(True)
-        self.chk_fast = QCheckBox("Accelerated mode (use almost all cores)")
+        self.chk_skip_existing = QCheckBox("Skip files already in the output folder")
+        self.chk_skip_existing.setChecked(True)
+        self.chk_fast = QCheckBox("Accelerated mode (more parallel downloads)")
         self.chk_fast.setChecked(True)
+        self.chk_fast.toggled.connect(self._apply_speed_preset)
+
+        self.spin_workers = QSpinBox()
+        self.spin_workers.setRange(1, MAX_WORKERS_LIMIT)
+        self.spin_fragments = QSpinBox()
+        self.spin_fragments.setRange(1, MAX_FRAGMENTS_LIMIT)
+        self._apply_speed_preset(self.chk_fast.isChecked())
 
         self.combo_format = QComboBox()
         self.combo_format.addItems([
             "MP3 (convert from source)",
+            "AAC/M4A (convert from source)",
+            "M4A/Opus (remux, no re-encoding)",
             "Original (no conversion, WEBM/M4A)"
         ])
         fmt_label = QLabel("Output format:")
 
         options_row = QHBoxLayout()
         options_row.addWidget(self.chk_metadata)
+        options_row.addWidget(self.chk_skip_existing)
         options_row.addWidget(self.chk_fast)
+        options_row.addWidget(QLabel("Workers:"))
+        options_row.addWidget(self.spin_workers)
+        options_row.addWidget(QLabel("Fragments:"))
+        options_row.addWidget(self.spin_fragments)
         options_row.addStretch(1)
         options_row.addWidget(fmt_label)
         options_row.addWidget(self.combo_format)
@@ -627,14 +891,18 @@ class MainWindow(QWidget):
 
         self.tracks: List[Track] = []
         self.futures: List[concurrent.futures.Future] = []
-        self.future_to_index: Dict[concurrent.futures.Future, int] = {}
-        self.executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
-        self.timer: Optional[QTimer] = None
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.executor_workers = 0
         self.done_count = 0
+        self.ok_cnt = self.fail_cnt = 0
         self.paused = False
-        self.mgr = multiprocessing.Manager()
-        self.kill_event = self.mgr.Event()
-        self.pause_event = self.mgr.Event()
+        self.kill_event = threading.Event()
+        self.pause_event = threading.Event()
+        self.resultReady.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+
+    def _apply_speed_preset(self, accelerated: bool):
+        self.spin_workers.setValue(_compute_workers(accelerated))
+        self.spin_fragments.setValue(_compute_fragments(accelerated))
 
     def choose_csv(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV Files (*.csv);;All Files (*)")
@@ -647,14 +915,17 @@ class MainWindow(QWidget):
             self.out_dir_edit.setText(path)
 
     def _fill_table(self):
-        self.table.setRowCount(0)
-        for t in self.tracks:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(t.title))
-            self.table.setItem(r, 1, QTableWidgetItem(t.artist))
-            self.table.setItem(r, 2, QTableWidgetItem("Waiting"))
-            self.table.setItem(r, 3, QTableWidgetItem(""))
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table.setRowCount(0)
+            self.table.setRowCount(len(self.tracks))
+            for r, t in enumerate(self.tracks):
+                self.table.setItem(r, 0, QTableWidgetItem(t.title))
+                self.table.setItem(r, 1, QTableWidgetItem(t.artist))
+                self.table.setItem(r, 2, QTableWidgetItem("Waiting"))
+                self.table.setItem(r, 3, QTableWidgetItem(""))
+        finally:
+            self.table.setUpdatesEnabled(True)
         self.btn_start.setEnabled(bool(self.tracks))
 
     def load_csv(self):
@@ -691,10 +962,15 @@ class MainWindow(QWidget):
             return
         os.makedirs(out_dir, exist_ok=True)
         embed = self.chk_metadata.isChecked()
+        skip_existing = self.chk_skip_existing.isChecked()
         accelerated = self.chk_fast.isChecked()
+        workers = self.spin_workers.value()
+        fragments = self.spin_fragments.value()
 
         fmt_text = self.combo_format.currentText().lower()
         keep_original = "original" in fmt_text
+        prefer_copy = "remux" in fmt_text
+        codec = "aac" if fmt_text.startswith("aac") else "mp3"
 
         if self.chk_spotify_audio.isChecked():
             self.chk_spotify_audio.setChecked(False)
@@ -707,36 +983,45 @@ class MainWindow(QWidget):
         self.pause_event.clear()
         self.paused = False
 
-        workers = _compute_workers(accelerated)
-        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        self._ensure_executor(workers)
+        settings = RunSettings(
+            out_dir, embed, accelerated, fragments, keep_original, prefer_copy, skip_existing, codec,
+            self.kill_event, self.pause_event, _ffmpeg_threads(workers),
+        )
 
         self.futures.clear()
-        self.future_to_index.clear()
         self.done_count = 0
+        self.ok_cnt = self.fail_cnt = 0
+
+        self.table.setUpdatesEnabled(False)
+        try:
+            for idx in range(len(self.tracks)):
+                self._set_cell(idx, 2, "At work")
+        finally:
+            self.table.setUpdatesEnabled(True)
 
         for idx, t in enumerate(self.tracks):
-            self.table.setItem(idx, 2, QTableWidgetItem("At work"))
-            fut = self.executor.submit(
-                process_one,
-                idx,
-                asdict(t),
-                out_dir,
-                embed,
-                self.kill_event,
-                self.pause_event,
-                accelerated,
-                keep_original,
-            )
+            fut = self.executor.submit(process_one, idx, t, settings)
             self.futures.append(fut)
-            self.future_to_index[fut] = idx
+            fut.add_done_callback(lambda f, i=idx: self._future_done(i, f))
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._poll_futures)
-        self.timer.start(200)
         self.btn_start.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self.btn_stop.setText("Pause")
 
+    def _ensure_executor(self, workers: int):
+        # the pool outlives a single run so its threads (and their YoutubeDL instances) are
+        # reused; only a different worker count needs a new pool
+        if self.executor and self.executor_workers == workers:
+            return
+        if self.executor:
+            try:
+                self.executor.shutdown(wait=False)
+            except Exception:
+                pass
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.executor_workers = workers
+
     def toggle_pause(self):
         if not self.futures:
             return
@@ -744,72 +1029,69 @@ class MainWindow(QWidget):
             self.pause_event.set()
             self.paused = True
             self.btn_stop.setText("Resume")
-            for row in range(self.table.rowCount()):
-                it = self.table.item(row, 2)
-                if it and it.text() in ("At work",):
-                    self.table.setItem(row, 2, QTableWidgetItem("Paused"))
+            self._swap_status("At work", "Paused")
         else:
             self.pause_event.clear()
             self.paused = False
             self.btn_stop.setText("Pause")
+            self._swap_status("Paused", "At work")
+
+    def _swap_status(self, old: str, new: str):
+        self.table.setUpdatesEnabled(False)
+        try:
             for row in range(self.table.rowCount()):
                 it = self.table.item(row, 2)
-                if it and it.text() == "Paused":
-                    self.table.setItem(row, 2, QTableWidgetItem("At work"))
+                if it and it.text() == old:
+                    it.setText(new)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+    def _set_cell(self, row: int, col: int, text: str):
+        # reuse the existing item; only rows that never had one get a new QTableWidgetItem
+        it = self.table.item(row, col)
+        if it:
+            it.setText(text)
+        else:
+            self.table.setItem(row, col, QTableWidgetItem(text))
 
-    def _poll_futures(self):
+    def _future_done(self, idx: int, fut: concurrent.futures.Future):
+        # runs on the executor's thread; the queued signal hands the result to the GUI thread
+        try:
+            _, ok, status, outpath = fut.result()
+        except CancelledError:
+            ok, status, outpath = False, "Canceled", ""
+        except Exception as e:
+            ok, status, outpath = False, f"Error: {e}", ""
+        self.resultReady.emit(idx, ok, status, outpath)
+
+    def _on_result(self, idx: int, ok: bool, status: str, outpath: str):
         if not self.futures:
             return
-        for fut in list(self.futures):
-            if not fut.done():
-                continue
-            self.futures.remove(fut)
-            idx = self.future_to_index.pop(fut, None)
-            try:
-                r_idx, ok, status, outpath = fut.result()
-                idx = r_idx if idx is None else idx
-            except (CancelledError, BrokenProcessPool):
-                ok, status, outpath = False, "Canceled", ""
-            except Exception as e:
-                ok, status, outpath = False, f"Error: {e}", ""
-            if idx is not None:
-                self.table.setItem(idx, 2, QTableWidgetItem(status))
-                if ok and outpath:
-                    self.table.setItem(idx, 3, QTableWidgetItem(outpath))
-            self.done_count += 1
+        self._set_cell(idx, 2, status)
+        if ok and outpath:
+            self._set_cell(idx, 3, outpath)
+        self.done_count += 1
+        if ok:
+            self.ok_cnt += 1
+        else:
+            self.fail_cnt += 1
 
         total_rows = self.table.rowCount()
         if total_rows > 0:
             self.overall_progress.setValue(int(100 * self.done_count / total_rows))
 
-        if not self.futures:
-            if self.timer:
-                self.timer.stop()
-                self.timer.deleteLater()
-                self.timer = None
-            if self.executor:
-                try:
-                    self.executor.shutdown(cancel_futures=False)
-                except Exception:
-                    pass
-                self.executor = None
+        if self.done_count >= len(self.futures):
+            self.futures.clear()
             self.btn_start.setEnabled(True)
             self.btn_stop.setEnabled(False)
-            ok_cnt = sum(
-                1 for i in range(self.table.rowCount())
-                if self.table.item(i, 2) and "Done" in self.table.item(i, 2).text()
+            QMessageBox.information(
+                self, "Done", f"Successfully: {self.ok_cnt}\nErrors/Canceled: {self.fail_cnt}"
             )
-            fail_cnt = self.table.rowCount() - ok_cnt
-            QMessageBox.information(self, "Done", f"Successfully: {ok_cnt}\nErrors/Canceled: {fail_cnt}")
 
     def closeEvent(self, event):
         try:
             self.pause_event.clear()
             self.kill_event.set()
-            if self.timer:
-                self.timer.stop()
-                self.timer.deleteLater()
-                self.timer = None
             if self.executor:
                 try:
                     self.executor.shutdown(wait=False, cancel_futures=True)
@@ -817,14 +1099,13 @@ class MainWindow(QWidget):
                     pass
                 self.executor = None
             self.futures.clear()
-            self.future_to_index.clear()
+            _COVER_POOL.shutdown(wait=False, cancel_futures=True)
         except Exception:
             pass
         event.accept()
 
 
 def main():
-    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()